@@ -2,8 +2,13 @@
 import os
 import json
 import sys
+import time
+import queue
 import platform
+import threading
 import subprocess
+import urllib.error
+import urllib.request
 from utils import log_info, log_error
 
 def detect_gpu():
@@ -41,25 +46,65 @@ def detect_os():
         log_error(f"Failed to detect OS: {e}", sys.exc_info())
         return "Unknown OS"
 
-def detect_cloud_provider():
+# Cloud metadata endpoints probed by detect_cloud_provider. Each entry is
+# (provider, url, request headers, response header that must be echoed back).
+CLOUD_METADATA_ENDPOINTS = [
+    ("AWS", "http://169.254.169.254/latest/meta-data/instance-id", {}, None),
+    ("Azure", "http://169.254.169.254/metadata/instance?api-version=2021-02-01", {"Metadata": "true"}, None),
+    ("GCP", "http://metadata.google.internal/computeMetadata/v1/", {"Metadata-Flavor": "Google"}, ("Metadata-Flavor", "Google")),
+]
+# Overall wall-clock budget for cloud detection, in seconds.
+CLOUD_PROBE_DEADLINE = 1.5
+
+# Metadata services are link-local, so never route the probes through a proxy.
+_metadata_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+def _probe_metadata_endpoint(provider, url, headers, expected_header, timeout):
+    """
+    Return `provider` if its metadata service answers, otherwise None.
+    """
+    request = urllib.request.Request(url, headers=headers)
     try:
-        # AWS
-        aws_url = "http://169.254.169.254/latest/meta-data/instance-id"
-        if subprocess.call(["curl", "-s", aws_url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0:
-            return "AWS"
-        
-        # Azure
-        azure_url = "http://169.254.169.254/metadata/instance"
-        headers = {"Metadata": "true"}
-        if subprocess.call(["curl", "-s", "-H", "Metadata:true", azure_url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0:
-            return "Azure"
-
-        # GCP
-        gcp_url = "http://metadata.google.internal/computeMetadata/v1/"
-        headers = {"Metadata-Flavor": "Google"}
-        if subprocess.call(["curl", "-s", "-H", "Metadata-Flavor:Google", gcp_url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0:
-            return "GCP"
+        with _metadata_opener.open(request, timeout=timeout) as response:
+            if response.status != 200:
+                return None
+            if expected_header and response.headers.get(expected_header[0]) != expected_header[1]:
+                return None
+            return provider
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+def probe_cloud_provider(endpoints=None, deadline=CLOUD_PROBE_DEADLINE):
+    """
+    Probe all cloud metadata endpoints concurrently and return the first provider
+    that answers, or "Unknown" once every probe has failed or `deadline` seconds
+    have passed. Probes still in flight are abandoned (they run on daemon threads).
+    """
+    endpoints = CLOUD_METADATA_ENDPOINTS if endpoints is None else endpoints
+    results = queue.Queue()
+
+    def worker(endpoint):
+        results.put(_probe_metadata_endpoint(*endpoint, timeout=deadline))
 
+    for endpoint in endpoints:
+        threading.Thread(target=worker, args=(endpoint,), name=f"cloud-probe-{endpoint[0]}", daemon=True).start()
+
+    end = time.monotonic() + deadline
+    for _ in endpoints:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            provider = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if provider:
+            return provider
+    return "Unknown"
+
+def detect_cloud_provider():
+    try:
+        return probe_cloud_provider()
     except Exception as e:
         log_error(f"Failed to detect cloud provider: {e}", sys.exc_info())
     return "Unknown"
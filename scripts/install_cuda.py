@@ -3,33 +3,16 @@ import sys
 import os
 import json
 import yaml
-import requests
+from detection import detect_cloud_provider
 from utils import log_info, log_error, safe_subprocess_call, rollback, record_apt_package
 
 def detect_cloud_environment():
-    try:
-        # AWS Check
-        aws_url = "http://169.254.169.254/latest/meta-data/"
-        if requests.get(aws_url, timeout=2).status_code == 200:
-            log_info("Detected AWS environment.")
-            return "AWS"
-
-        # Azure Check
-        azure_url = "http://169.254.169.254/metadata/instance?api-version=2021-02-01"
-        headers = {"Metadata": "true"}
-        if requests.get(azure_url, headers=headers, timeout=2).status_code == 200:
-            log_info("Detected Azure environment.")
-            return "Azure"
-
-        # GCP Check
-        gcp_url = "http://metadata.google.internal/computeMetadata/v1/"
-        headers = {"Metadata-Flavor": "Google"}
-        if requests.get(gcp_url, headers=headers, timeout=2).status_code == 200:
-            log_info("Detected GCP environment.")
-            return "GCP"
-    except requests.exceptions.RequestException:
+    provider = detect_cloud_provider()
+    if provider == "Unknown":
         log_info("No cloud environment detected.")
-    return "On-Prem"
+        return "On-Prem"
+    log_info(f"Detected {provider} environment.")
+    return provider
 
 def configure_ldconfig(cuda_path):
     log_info("Configuring ldconfig for CUDA and cuDNN.")
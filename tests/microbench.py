@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the setup tool's internals. These run against local
+stand-ins (HTTP servers, fake binaries) so they need no GPU or cloud access.
+
+Usage: python3 tests/microbench.py <benchmark>
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import detection
+
+def _start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def bench_cloud_probe(args):
+    """
+    Compare sequential probing (old behaviour, 2 s timeout per provider) with the
+    concurrent probe engine against a local metadata stand-in where only the last
+    provider answers and the others hang.
+    """
+    class MetadataHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/gcp"):
+                self.send_response(200)
+                self.send_header("Metadata-Flavor", "Google")
+                self.end_headers()
+                return
+            time.sleep(args.hang)
+
+        def log_message(self, *_):
+            pass
+
+    server = _start_server(MetadataHandler)
+    base = f"http://127.0.0.1:{server.server_port}"
+    endpoints = [
+        ("AWS", f"{base}/aws", {}, None),
+        ("Azure", f"{base}/azure", {"Metadata": "true"}, None),
+        ("GCP", f"{base}/gcp", {"Metadata-Flavor": "Google"}, ("Metadata-Flavor", "Google")),
+    ]
+
+    start = time.perf_counter()
+    sequential = "Unknown"
+    for endpoint in endpoints:
+        if detection._probe_metadata_endpoint(*endpoint, timeout=2):
+            sequential = endpoint[0]
+            break
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = detection.probe_cloud_provider(endpoints)
+    concurrent_s = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"sequential: {sequential} in {sequential_s * 1000:.1f} ms")
+    print(f"concurrent: {concurrent} in {concurrent_s * 1000:.1f} ms")
+
+BENCHMARKS = {
+    "cloud-probe": bench_cloud_probe,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run setup tool micro-benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--hang", type=float, default=3.0,
+                        help="Seconds a non-answering metadata endpoint stalls (cloud-probe).")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()